@@ -8,15 +8,30 @@ import random
 import string
 import datetime
 import re
-from collections import defaultdict, Counter, namedtuple
-from typing import List, Dict, Any, Tuple
+import operator
+from array import array
+from collections import defaultdict, Counter, namedtuple, deque
+from collections.abc import Mapping
+from typing import List, Dict, Any, Optional, Tuple
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 # ------------------- File & Directory Utilities -------------------
 
 def list_files_in_directory(directory: str) -> List[str]:
     try:
-        return [f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))]
+        with os.scandir(directory) as entries:
+            return [entry.name for entry in entries if entry.is_file()]
     except Exception as e:
         print(f"Error listing files in {directory}: {e}")
         return []
@@ -27,15 +42,61 @@ def create_directory(path: str):
         os.makedirs(path)
 
 
+_ORJSON_WRITE_OPTIONS = (orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+                         if orjson is not None else 0)
+
+
+# 20+ digit runs may be integers beyond 64 bits (or just long strings/floats,
+# which the stdlib parser handles identically).
+_LONG_DIGITS_RE = re.compile(rb'\d{20,}')
+
+
+def _has_non_finite(obj) -> bool:
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(v) for v in obj)
+    if np is not None and isinstance(obj, np.ndarray):
+        return obj.dtype.kind in 'fc' and not np.isfinite(obj).all()
+    return False
+
+
+def _json_default(obj):
+    # Lets the stdlib fallback write the NumPy values orjson would have accepted.
+    if np is not None and isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
 def write_json(filepath: str, data: Dict):
+    if orjson is not None:
+        try:
+            payload = orjson.dumps(data, option=_ORJSON_WRITE_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits; the stdlib encoder handles these.
+            payload = None
+        # orjson writes NaN/Infinity as null, so only trust a payload with a
+        # null in it once the data is known to be all finite.
+        if payload is not None and (b'null' not in payload or not _has_non_finite(data)):
+            Path(filepath).write_bytes(payload)
+            return
     with open(filepath, 'w') as f:
-        json.dump(data, f, indent=4)
+        json.dump(data, f, indent=4, default=_json_default)
 
 
 def read_json(filepath: str) -> Dict:
     try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
+        raw = Path(filepath).read_bytes()
+        # orjson turns integers past 64 bits into floats; keep those files exact.
+        if orjson is not None and not _LONG_DIGITS_RE.search(raw):
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                # e.g. NaN/Infinity, which json.dump writes by default.
+                pass
+        return json.loads(raw)
     except Exception as e:
         print(f"Failed to read JSON: {e}")
         return {}
@@ -43,59 +104,92 @@ def read_json(filepath: str) -> Dict:
 
 # ------------------- String Utilities -------------------
 
+_ALPHANUM = (string.ascii_letters + string.digits).encode()
+_ALPHANUM_TABLE = bytes(_ALPHANUM[i % len(_ALPHANUM)] for i in range(256))
+_ALPHANUM_REJECT = bytes(range(len(_ALPHANUM) * 4, 256))
+
+
 def random_string(length: int = 10) -> str:
-    return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
+    # Map OS random bytes onto [A-Za-z0-9]; bytes >= 248 are dropped so every
+    # character stays equally likely.
+    out = b''
+    while len(out) < length:
+        out += os.urandom(length - len(out) + 8).translate(_ALPHANUM_TABLE, _ALPHANUM_REJECT)
+    return out[:length].decode('ascii')
+
+
+_EMAIL_RE = re.compile(r'^[\w\.-]+@[\w\.-]+\.\w+$')
 
 
 def is_valid_email(email: str) -> bool:
-    pattern = r'^[\w\.-]+@[\w\.-]+\.\w+$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.match(email) is not None
 
 
 # ------------------- Math Utilities -------------------
 
 def compute_mean(numbers: List[float]) -> float:
+    if np is not None:
+        a = np.asarray(numbers, dtype=np.float64)
+        return float(a.mean()) if a.size else 0.0
     return sum(numbers) / len(numbers) if numbers else 0.0
 
 
 def compute_std_dev(numbers: List[float]) -> float:
+    if np is not None:
+        a = np.asarray(numbers, dtype=np.float64)
+        return float(a.std()) if a.size else 0.0
     mean = compute_mean(numbers)
     return math.sqrt(sum((x - mean) ** 2 for x in numbers) / len(numbers)) if numbers else 0.0
 
 
 # ------------------- CSV Utilities -------------------
 
-def write_csv(filepath: str, data: List[Dict[str, Any]], headers: List[str]):
+def write_csv_rows(filepath: str, headers: List[str], rows):
     try:
         with open(filepath, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=headers)
-            writer.writeheader()
-            writer.writerows(data)
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            writer.writerows(rows)
     except Exception as e:
         print(f"Failed to write CSV: {e}")
 
 
-def read_csv(filepath: str) -> List[Dict[str, str]]:
+def write_csv(filepath: str, data: List[Dict[str, Any]], headers: List[str]):
+    write_csv_rows(filepath, headers, ([d.get(h, '') for h in headers] for d in data))
+
+
+def read_csv_rows(filepath: str) -> Tuple[List[str], List[List[str]]]:
     try:
-        with open(filepath, 'r') as f:
-            reader = csv.DictReader(f)
-            return list(reader)
+        with open(filepath, 'r', newline='') as f:
+            reader = csv.reader(f)
+            headers = next(reader, [])
+            # Like DictReader, skip blank lines rather than yielding empty rows.
+            return headers, [row for row in reader if row]
     except Exception as e:
         print(f"Failed to read CSV: {e}")
-        return []
+        return [], []
+
+
+def read_csv(filepath: str) -> List[Dict[str, str]]:
+    headers, rows = read_csv_rows(filepath)
+    return [dict(zip(headers, row)) for row in rows]
 
 
 # ------------------- Data Models -------------------
 
 Person = namedtuple("Person", ["name", "email", "age"])
 
+USER_LOG_MAXLEN = 1024
+
 class User:
+    __slots__ = ('name', 'email', 'age', 'created_at', 'logs')
+
     def __init__(self, name: str, email: str, age: int):
         self.name = name
         self.email = email
         self.age = age
         self.created_at = datetime.datetime.now()
-        self.logs = []
+        self.logs: deque = deque(maxlen=USER_LOG_MAXLEN)  # (time_ns, message)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -106,46 +200,169 @@ class User:
         }
 
     def log(self, message: str):
-        timestamp = datetime.datetime.now().isoformat()
-        self.logs.append(f"{timestamp} - {message}")
+        self.logs.append((time.time_ns(), message))
+
+    def iter_logs(self):
+        for ts_ns, message in self.logs:
+            timestamp = datetime.datetime.fromtimestamp(ts_ns / 1e9).isoformat()
+            yield f"{timestamp} - {message}"
 
     def __str__(self):
         return f"User(name={self.name}, email={self.email}, age={self.age})"
 
 
+USER_ROW_FIELDS = ('name', 'email', 'age', 'created_at')
+
+
+def _make_users_to_rows(fields):
+    # Generates a function whose body is the literal `(u.name, u.email, ...)`,
+    # so each row is one tuple build with no per-field loop.
+    row = ', '.join(f'u.{field}' for field in fields)
+    namespace = {}
+    exec(f"def users_to_rows(users):\n    return [({row},) for u in users]\n", namespace)
+    return namespace['users_to_rows']
+
+
+users_to_rows = _make_users_to_rows(USER_ROW_FIELDS)
+
+
 # ------------------- Simulated App -------------------
 
+def _as_age(age) -> Optional[int]:
+    # Accepts ints and int-like values (NumPy integers, integral floats like 30.0)
+    # that fit the one-byte ages column; None means the age is invalid.
+    try:
+        value = operator.index(age)
+    except TypeError:
+        if not (isinstance(age, float) and age.is_integer()):
+            return None
+        value = int(age)
+    return value if 0 <= value <= 255 else None
+
+
+def _age_to_column(age) -> int:
+    value = _as_age(age)
+    if value is None:
+        raise ValueError(f"Invalid age: {age!r}")
+    return value
+
+
+def _column_property(column: str, to_python=None, to_column=None):
+    def fget(self):
+        value = getattr(self._app, column)[self._app.index[self._email]]
+        return to_python(value) if to_python else value
+
+    def fset(self, value):
+        getattr(self._app, column)[self._app.index[self._email]] = to_column(value) if to_column else value
+
+    return property(fget, fset)
+
+
+class _UserRecord(User):
+    # A User backed by GenericApp's columns: attribute reads and writes go
+    # straight to the row stored for this email.
+    __slots__ = ('_app', '_email')
+
+    def __init__(self, app: "GenericApp", email: str):
+        self._app = app
+        self._email = email
+
+    name = _column_property('names')
+    age = _column_property('ages', to_column=_age_to_column)
+    created_at = _column_property('created', datetime.datetime.fromtimestamp, lambda dt: dt.timestamp())
+    logs = _column_property('logs')
+
+    @property
+    def email(self) -> str:
+        # Read-only: the email is the row's key in GenericApp.index.
+        return self._email
+
+
+class _UsersView(Mapping):
+    # Read-only email -> User mapping over GenericApp's columns. Each lookup
+    # returns a write-through _UserRecord for just that row.
+    def __init__(self, app: "GenericApp"):
+        self._app = app
+
+    def __getitem__(self, email: str) -> User:
+        if email not in self._app.index:
+            raise KeyError(email)
+        return _UserRecord(self._app, email)
+
+    def __contains__(self, email) -> bool:
+        return email in self._app.index
+
+    def __iter__(self):
+        return iter(self._app.index)
+
+    def __len__(self) -> int:
+        return len(self._app.index)
+
+
 class GenericApp:
+    # Users are stored column-wise, one list/array per field, with an
+    # email -> row index. Scans (list/export) walk the columns directly.
     def __init__(self):
-        self.users: Dict[str, User] = {}
+        self.names: List[str] = []
+        self.emails: List[str] = []
+        self.ages = array('B')
+        self.created = array('d')  # POSIX timestamps
+        self.logs: List[deque] = []
+        self.index: Dict[str, int] = {}
+
+    @property
+    def users(self) -> Mapping[str, User]:
+        return _UsersView(self)
+
+    def _columns(self):
+        return (self.names, self.emails, self.ages, self.created, self.logs)
 
     def add_user(self, name: str, email: str, age: int):
-        if email in self.users:
+        if email in self.index:
             print(f"User with email {email} already exists.")
             return
         if not is_valid_email(email):
             print("Invalid email address.")
             return
+        age = _as_age(age)
+        if age is None:
+            print("Invalid age.")
+            return
         user = User(name, email, age)
-        self.users[email] = user
         user.log("User added.")
+        # Append ages first (the one column that can reject a value) and
+        # register the index last, so a failure never leaves columns misaligned.
+        self.ages.append(age)
+        self.names.append(name)
+        self.emails.append(email)
+        self.created.append(user.created_at.timestamp())
+        self.logs.append(user.logs)
+        self.index[email] = len(self.emails) - 1
         print(f"Added: {user}")
 
     def remove_user(self, email: str):
-        if email in self.users:
-            del self.users[email]
-            print(f"Removed user with email {email}.")
-        else:
+        i = self.index.pop(email, None)
+        if i is None:
             print("User not found.")
+            return
+        # Move the last row into the hole so removal stays O(1).
+        last = len(self.emails) - 1
+        for column in self._columns():
+            if i != last:
+                column[i] = column[last]
+            column.pop()
+        if i != last:
+            self.index[self.emails[i]] = i
+        print(f"Removed user with email {email}.")
 
     def list_users(self):
-        for user in self.users.values():
-            print(user)
+        for name, email, age in zip(self.names, self.emails, self.ages):
+            print(f"User(name={name}, email={email}, age={age})")
 
     def export_users(self, filepath: str):
-        data = [user.to_dict() for user in self.users.values()]
-        headers = list(data[0].keys()) if data else []
-        write_csv(filepath, data, headers)
+        headers = ["name", "email", "age", "created_at"] if self.emails else []
+        created = (datetime.datetime.fromtimestamp(ts).isoformat() for ts in self.created)
+        write_csv_rows(filepath, headers, zip(self.names, self.emails, self.ages, created))
         print(f"Exported users to {filepath}")
 
 
@@ -206,147 +423,3 @@ if __name__ == "__main__":
         print("\nInterrupted by user.")
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
-
-import threading
-import queue
-import uuid
-import hashlib
-import logging
-import shutil
-import tempfile
-
-from functools import lru_cache, wraps
-from pathlib import Path
-from http.server import BaseHTTPRequestHandler, HTTPServer
-
-# Setup logger
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-# ------------------- Caching Utilities -------------------
-
-@lru_cache(maxsize=128)
-def expensive_computation(x):
-    logger.info(f"Computing expensive_computation({x})")
-    time.sleep(2)
-    return x ** 2 + x
-
-# ------------------- Decorators -------------------
-
-def timing_decorator(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        start = time.time()
-        result = func(*args, **kwargs)
-        end = time.time()
-        print(f"{func.__name__} took {end - start:.2f} seconds")
-        return result
-    return wrapper
-
-# ------------------- File Backup Utilities -------------------
-
-def backup_file(src_path):
-    try:
-        backup_path = src_path + ".bak"
-        shutil.copy(src_path, backup_path)
-        logger.info(f"Backed up {src_path} to {backup_path}")
-        return backup_path
-    except Exception as e:
-        logger.error(f"Backup failed: {e}")
-        return None
-
-# ------------------- UUID & Hash Utilities -------------------
-
-def generate_uuid() -> str:
-    return str(uuid.uuid4())
-
-def hash_string(s: str) -> str:
-    return hashlib.sha256(s.encode()).hexdigest()
-
-# ------------------- Queue and Threads -------------------
-
-class Worker(threading.Thread):
-    def __init__(self, q):
-        super().__init__()
-        self.q = q
-        self.daemon = True
-        self.start()
-
-    def run(self):
-        while True:
-            func, args = self.q.get()
-            try:
-                logger.info(f"Running: {func.__name__} with args: {args}")
-                func(*args)
-            except Exception as e:
-                logger.error(f"Error in worker thread: {e}")
-            self.q.task_done()
-
-# ------------------- Minimal Web Server -------------------
-
-class SimpleHandler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        self.wfile.write(b"<html><body><h1>Hello from Python Server!</h1></body></html>")
-
-
-def start_web_server(port=8000):
-    server_address = ('', port)
-    httpd = HTTPServer(server_address, SimpleHandler)
-    logger.info(f"Starting server on port {port}...")
-    try:
-        httpd.serve_forever()
-    except KeyboardInterrupt:
-        logger.info("Shutting down server.")
-        httpd.server_close()
-
-# ------------------- Temporary File Utilities -------------------
-
-def write_temp_file(content: str) -> str:
-    temp_file = tempfile.NamedTemporaryFile(delete=False, mode='w', suffix='.txt')
-    temp_file.write(content)
-    temp_file.close()
-    logger.info(f"Temp file written to: {temp_file.name}")
-    return temp_file.name
-
-# ------------------- Execute When Run Directly -------------------
-
-if __name__ == '__main__':
-    print("Generated UUID:", generate_uuid())
-    print("Hash of 'example':", hash_string("example"))
-
-    print("Performing expensive computation with cache:")
-    print(expensive_computation(10))
-    print(expensive_computation(10))  # Cached
-
-    # Setup and run a worker thread
-    q = queue.Queue()
-    worker = Worker(q)
-
-    def dummy_task(x):
-        print(f"Dummy task executed with {x}")
-
-    q.put((dummy_task, (42,)))
-    q.join()
-
-    # Start web server in a thread
-    threading.Thread(target=start_web_server, daemon=True).start()
-
-    # Wait a moment for server to start
-    time.sleep(2)
-
-    # Write temp file
-    write_temp_file("This is a temporary test.")
-
-    # Back up an example file
-    test_file = write_temp_file("backup test content")
-    backup_file(test_file)
-
-    print("All tasks completed. Press Ctrl+C to exit.")
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("Goodbye!")